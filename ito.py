@@ -1,11 +1,28 @@
+import collections
+import contextlib
+import itertools
 import json
 import os
-import random
+import re
+import secrets
 import string
-from datetime import datetime
+import time
+from urllib.parse import quote
 
+import numpy as np
+import pandas as pd
 import streamlit as st
 
+try:
+    import orjson
+except ImportError:  # orjson é opcional; usa o json da stdlib como fallback
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos no índice
+    fcntl = None
+
 # Configuração da página
 st.set_page_config(
     page_title="Ito Game",
@@ -13,30 +30,172 @@ st.set_page_config(
     layout="wide"
 )
 
-# Arquivo para armazenar estado dos jogos
+# Diretório com um arquivo JSON por sala, mais um índice com o resumo das salas.
+# O nome do índice começa com '_' para nunca coincidir com um código de sala.
+GAMES_DIR = "games"
+INDEX_FILE = os.path.join(GAMES_DIR, "_index.json")
+INDEX_LOCK_FILE = os.path.join(GAMES_DIR, "_index.lock")
+
+# Arquivo único usado por versões anteriores (migrado para GAMES_DIR)
 GAMES_FILE = "games_state.json"
 
+# Gerador usado para sortear as cartas
+_RNG = np.random.default_rng()
+
+# Caracteres dos códigos de sala e gerador criptograficamente seguro para sorteá-los
+_ROOM_CODE_ALPHABET = string.ascii_uppercase + string.digits
+_ROOM_CODE_RNG = secrets.SystemRandom()
+_ROOM_CODE_RE = re.compile(r'[A-Z0-9]{6}')
+
+
+def _json_loads(data):
+    """Decodifica JSON a partir de bytes (orjson se disponível)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj):
+    """Codifica JSON compacto em bytes (orjson se disponível)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
 
-def load_games():
-    """Carrega o estado dos jogos do arquivo JSON"""
-    if os.path.exists(GAMES_FILE):
+
+def _read_json(path, default):
+    """Lê um arquivo JSON, retornando `default` se não existir ou for inválido"""
+    if os.path.exists(path):
         try:
-            with open(GAMES_FILE, 'r') as f:
-                return json.load(f)
+            with open(path, 'rb') as f:
+                return _json_loads(f.read())
         except Exception:
-            return {}
-    return {}
+            return default
+    return default
+
+
+def _file_version(stat_result):
+    """Identifica uma versão de arquivo; cada os.replace gera um novo inode"""
+    return (stat_result.st_mtime_ns, stat_result.st_ino)
+
+
+def _write_json(path, obj):
+    """Escreve um objeto em um arquivo JSON de forma atômica e retorna sua versão"""
+    # Grava em um arquivo temporário único e renomeia, para nunca deixar o arquivo
+    # truncado nem misturar escritas de sessões concorrentes. O modo 0o666 respeita
+    # a umask, como um open() comum (mkstemp criaria o arquivo com 0o600)
+    tmp = f"{path}.{secrets.token_hex(8)}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            # Mantém as permissões de um arquivo já existente
+            try:
+                os.fchmod(f.fileno(), os.stat(path).st_mode & 0o7777)
+            except FileNotFoundError:
+                pass
+            f.write(_json_dumps(obj))
+            f.flush()
+            # Versão lida antes da troca: outra sessão pode substituir `path` logo depois
+            version = _file_version(os.fstat(f.fileno()))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return version
+
+
+def _room_file(room_code):
+    """Caminho do arquivo de uma sala"""
+    return os.path.join(GAMES_DIR, f"{room_code}.json")
 
 
-def save_games(games):
-    """Salva o estado dos jogos no arquivo JSON"""
-    with open(GAMES_FILE, 'w') as f:
-        json.dump(games, f, indent=2)
+def _index_entry(game):
+    """Resumo de uma sala guardado no índice"""
+    return {'players': len(game['players']), 'status': game['status']}
+
+
+@contextlib.contextmanager
+def _index_lock():
+    """Trava exclusiva para ler, alterar e regravar o índice sem perder entradas"""
+    with open(INDEX_LOCK_FILE, 'ab') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def ensure_games_dir():
+    """Cria o diretório de salas, migrando o arquivo único antigo se existir"""
+    # O índice só é criado ao final da migração e serve de marcador: se o
+    # processo morrer no meio, a próxima execução refaz a migração
+    if os.path.exists(INDEX_FILE):
+        return
+
+    os.makedirs(GAMES_DIR, exist_ok=True)
+    legacy_games = _read_json(GAMES_FILE, {})
+    for room_code, game in legacy_games.items():
+        path = _room_file(room_code)
+        # Não sobrescreve salas já copiadas ou salvas por outra sessão
+        if _ROOM_CODE_RE.fullmatch(room_code) and not os.path.exists(path):
+            _write_json(path, game)
+
+    # Mescla com o índice que outra sessão possa ter criado enquanto isso
+    with _index_lock():
+        index = {k: _index_entry(v) for k, v in legacy_games.items() if _ROOM_CODE_RE.fullmatch(k)}
+        index.update(load_index())
+        _write_json(INDEX_FILE, index)
+
+
+def load_index():
+    """Carrega o índice de salas (código -> jogadores e status)"""
+    return _read_json(INDEX_FILE, {})
+
+
+def save_game(room_code, game):
+    """Salva o estado de uma sala e atualiza o índice se necessário"""
+    version = _write_json(_room_file(room_code), game)
+
+    entry = _index_entry(game)
+    with _index_lock():
+        index = load_index()
+        if index.get(room_code) != entry:
+            index[room_code] = entry
+            _write_json(INDEX_FILE, index)
+
+    # Atualiza o cache da sessão para evitar reler o que acabamos de escrever
+    st.session_state.setdefault('_games', {})[room_code] = (version, game)
+
+
+def get_game(room_code):
+    """Retorna o estado de uma sala, relendo o arquivo apenas se ele mudou"""
+    # Só aceita códigos no formato gerado; evita caminhos arbitrários vindos da URL
+    if not _ROOM_CODE_RE.fullmatch(room_code):
+        return None
+
+    cache = st.session_state.setdefault('_games', {})
+    try:
+        # Versão e conteúdo vêm do mesmo descritor, então sempre correspondem
+        with open(_room_file(room_code), 'rb') as f:
+            version = _file_version(os.fstat(f.fileno()))
+            cached = cache.get(room_code)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            game = _json_loads(f.read())
+    except Exception:
+        return None
+
+    cache[room_code] = (version, game)
+    return game
 
 
 def generate_room_code():
     """Gera um código único para a sala"""
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+    return ''.join(_ROOM_CODE_RNG.choices(_ROOM_CODE_ALPHABET, k=6))
 
 
 def create_new_game(room_code, players, max_rounds=5):
@@ -47,8 +206,9 @@ def create_new_game(room_code, players, max_rounds=5):
         'current_round': 1,
         'max_rounds': max_rounds,
         'cards_per_round': {},
+        'sorted_cards': {},
         'results': {},
-        'created_at': datetime.now().isoformat(),
+        'created_at': int(time.time()),
         'status': 'waiting'  # waiting, playing, finished
     }
 
@@ -57,21 +217,77 @@ def distribute_cards(players, round_num, card_range=(1, 100)):
     """Distribui cartas para os jogadores"""
     num_players = len(players)
     cards_needed = num_players * round_num
-    if cards_needed > (card_range[1] - card_range[0] + 1):
+    deck_size = card_range[1] - card_range[0] + 1
+    if cards_needed > deck_size:
         st.error(f"Não há cartas suficientes para {num_players} jogadores na rodada {round_num}")
         return None
 
-    all_cards = list(range(card_range[0], card_range[1] + 1))
-    selected_cards = random.sample(all_cards, cards_needed)
+    # Sorteia índices do baralho sem materializar a lista de cartas
+    picks = (_RNG.choice(deck_size, size=cards_needed, replace=False) + card_range[0]).tolist()
 
     # Distribui as cartas entre os jogadores
     player_cards = {}
     for i, player in enumerate(players):
-        player_cards[player] = selected_cards[i*round_num:(i+1)*round_num]
+        player_cards[player] = picks[i*round_num:(i+1)*round_num]
 
     return player_cards
 
 
+# Estilos das cartas, injetados uma vez por renderização e referenciados por classe
+_CARD_STYLES = (
+    "<style>"
+    ".ito-card-grid{display:grid;gap:10px;}"
+    ".ito-card{color:#fff;padding:15px;border-radius:10px;text-align:center;font-size:16px;font-weight:bold;"
+    "box-shadow:0 4px 8px rgba(0,0,0,0.2);}"
+    ".ito-card span{font-size:24px;}"
+    ".ito-card-ok{background:linear-gradient(45deg,#4CAF50,#45a049);}"
+    ".ito-card-bad{background:linear-gradient(45deg,#f44336,#da190b);}"
+    ".ito-card-player{background:linear-gradient(45deg,#FF6B6B,#4ECDC4);padding:20px;font-size:24px;box-shadow:none;}"
+    "</style>"
+)
+
+# Modelos HTML das cartas, montados em uma única grade por chamada de st.markdown
+_CARD_GRID_TEMPLATE = "<div class='ito-card-grid' style='grid-template-columns:repeat({columns},1fr);'>{cards}</div>"
+_CARD_TEMPLATE = "<div class='ito-card {css_class}'>{status}<br><span>{card}</span><br><small>{result_text}</small></div>"
+_PLAYER_CARD_TEMPLATE = "<div class='ito-card ito-card-player'>{card}</div>"
+
+
+def render_reveal_cards(result, count):
+    """Mostra as primeiras `count` cartas reveladas de um resultado em uma única grade"""
+    correct_order = result['correct_order']
+    played_order = result['played_order']
+
+    cards_html = []
+    for i in range(count):
+        card = correct_order[i]
+        played_card = played_order[i] if i < len(played_order) else None
+
+        # Determinar se está correto
+        if played_card == card:
+            cards_html.append(_CARD_TEMPLATE.format(
+                css_class="ito-card-ok", status="✅", card=card, result_text="CORRETO!"
+            ))
+        else:
+            cards_html.append(_CARD_TEMPLATE.format(
+                css_class="ito-card-bad", status="❌", card=card,
+                result_text=f"Era {played_card if played_card else '?'}"
+            ))
+
+    st.markdown(
+        _CARD_STYLES + _CARD_GRID_TEMPLATE.format(columns=min(count, 6), cards=''.join(cards_html)),
+        unsafe_allow_html=True
+    )
+
+
+def render_player_cards(player_cards):
+    """Mostra as cartas de um jogador em uma única grade"""
+    cards_html = ''.join(_PLAYER_CARD_TEMPLATE.format(card=card) for card in player_cards)
+    st.markdown(
+        _CARD_STYLES + _CARD_GRID_TEMPLATE.format(columns=len(player_cards), cards=cards_html),
+        unsafe_allow_html=True
+    )
+
+
 def main():
     st.title("🎮 Ito Game")
     st.markdown("---")
@@ -81,15 +297,14 @@ def main():
     room_code = query_params.get("room", "")
     player_id = query_params.get("player", "")
 
-    games = load_games()
+    ensure_games_dir()
+    game = get_game(room_code) if room_code else None
 
     # Sidebar para navegação
     st.sidebar.title("🎯 Menu")
 
-    if room_code and room_code in games:
+    if game is not None:
         # Se já está em uma sala válida
-        game = games[room_code]
-
         if player_id:
             # Visualização do jogador individual
             st.sidebar.success(f"Sala: {room_code}")
@@ -98,7 +313,7 @@ def main():
         else:
             # Visualização do administrador da sala
             st.sidebar.success(f"Administrando: {room_code}")
-            show_admin_view(room_code, game, games)
+            show_admin_view(room_code, game)
     else:
         # Menu principal
         option = st.sidebar.selectbox(
@@ -109,7 +324,7 @@ def main():
         if option == "🆕 Criar Sala":
             show_create_room()
         elif option == "🚪 Entrar em Sala":
-            show_join_room(games)
+            show_join_room()
         else:
             show_home()
 
@@ -182,16 +397,15 @@ def show_create_room():
         submitted = st.form_submit_button("🎯 Criar Sala")
 
         if submitted:
-            games = load_games()
+            index = load_index()
             room_code = generate_room_code()
 
             # Garante que o código seja único
-            while room_code in games:
+            while room_code in index:
                 room_code = generate_room_code()
 
             game = create_new_game(room_code, player_names, max_rounds)
-            games[room_code] = game
-            save_games(games)
+            save_game(room_code, game)
 
             st.success(f"✅ Sala criada com sucesso!")
             st.info(f"🔑 Código da sala: **{room_code}**")
@@ -201,26 +415,29 @@ def show_create_room():
             # URLs para cada jogador
             base_url = "itocardgame.streamlit.app"  # Mude para sua URL quando fizer deploy
 
-            for i, player in enumerate(player_names):
-                encoded_name = player.replace(" ", "%20")
-                player_url = f"{base_url}/?room={room_code}&player={encoded_name}"
-                st.markdown(f"**{player}:** [{player_url}]({player_url})")
+            lines = []
+            for player in player_names:
+                player_url = f"{base_url}/?room={room_code}&player={quote(player, safe='')}"
+                lines.append(f"**{player}:** [{player_url}]({player_url})")
 
             # URL do administrador
             admin_url = f"{base_url}/?room={room_code}"
-            st.markdown(f"**🎮 Administrador:** [{admin_url}]({admin_url})")
+            lines.append(f"**🎮 Administrador:** [{admin_url}]({admin_url})")
+
+            st.markdown("\n\n".join(lines))
 
 
-def show_join_room(games):
+def show_join_room():
     """Interface para entrar em uma sala existente"""
     st.header("🚪 Entrar em Sala")
 
-    if not games:
+    index = load_index()
+    if not index:
         st.warning("Não há salas ativas no momento.")
         return
 
     # Lista salas ativas
-    active_rooms = {k: v for k, v in games.items() if v['status'] != 'finished'}
+    active_rooms = {k: v for k, v in index.items() if v['status'] != 'finished'}
 
     if not active_rooms:
         st.warning("Não há salas ativas no momento.")
@@ -229,7 +446,7 @@ def show_join_room(games):
     room_code = st.selectbox(
         "Escolha uma sala:",
         options=list(active_rooms.keys()),
-        format_func=lambda x: f"{x} - {len(active_rooms[x]['players'])} jogadores"
+        format_func=lambda x: f"{x} - {active_rooms[x]['players']} jogadores"
     )
 
     if st.button("🎯 Entrar na Sala"):
@@ -237,10 +454,13 @@ def show_join_room(games):
         st.rerun()
 
 
-def show_admin_view(room_code, game, games):
+def show_admin_view(room_code, game):
     """Interface do administrador da sala"""
     st.header(f"🎮 Administrador - Sala {room_code}")
 
+    # Indica se o jogo foi alterado (e salvo) nesta execução e a página deve ser recarregada
+    needs_rerun = False
+
     # Status do jogo
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -262,12 +482,15 @@ def show_admin_view(room_code, game, games):
 
             if cards:
                 game['cards_per_round'][str(current_round)] = cards
+                # Ordem correta calculada uma única vez por rodada
+                game.setdefault('sorted_cards', {})[str(current_round)] = sorted(
+                    itertools.chain.from_iterable(cards.values())
+                )
                 game['status'] = 'playing'
-                games[room_code] = game
-                save_games(games)
+                save_game(room_code, game)
+                needs_rerun = True
 
                 st.success(f"✅ Cartas distribuídas para rodada {current_round}!")
-                st.rerun()
 
     elif game['status'] == 'playing':
         current_round = game['current_round']
@@ -287,78 +510,88 @@ def show_admin_view(room_code, game, games):
             st.write("Digite a ordem em que os items foram colocados:")
 
             total_cards = len(game['players']) * current_round
-            # Create selection boxes for each position
+            # Single editable table with one player selector per position
             st.write(f"Selecione o jogador para cada posição (total: {total_cards} posições):")
 
-            player_selections = []
-            cols = st.columns(min(3, total_cards))
             unique_players = list(game['players'])
-            for i in range(total_cards):
-                with cols[i % 3]:
-                    selection = st.selectbox(
-                        f"Posição {i + 1}",
-                        options=unique_players,
-                        key=f"pos_{i}"
-                    )
-                    player_selections.append(selection)
+            order_table = st.data_editor(
+                pd.DataFrame({
+                    'Posição': range(1, total_cards + 1),
+                    'Jogador': [unique_players[0]] * total_cards
+                }),
+                column_config={
+                    'Posição': st.column_config.NumberColumn(disabled=True),
+                    'Jogador': st.column_config.SelectboxColumn(options=unique_players, required=True)
+                },
+                hide_index=True,
+                key=f'order_editor_{current_round}'
+            )
+            player_selections = order_table['Jogador'].tolist()
 
             submitted = st.form_submit_button("🔍 Verificar Ordem")
 
             if submitted:
-                try:
-                    # Convert player selections to their corresponding numbers
-                    played_order = []
-                    round_cards = game['cards_per_round'][str(current_round)]
-
-                    for player in player_selections:
-                        # Get the player's unused card with the lowest value
-                        player_cards = sorted(round_cards[player])
-                        card = player_cards[sum(1 for p in player_selections[:len(played_order)] if p == player)]
-                        played_order.append(card)
-
-                    if len(played_order) != total_cards:
-                        st.error(f"Você deve inserir exatamente {total_cards} números!")
-                    else:
-                        # Verificar se a ordem está correta
-                        cards = game['cards_per_round'][str(current_round)]
-                        all_cards = []
-                        for player_cards in cards.values():
-                            all_cards.extend(player_cards)
-
-                        correct_order = sorted(all_cards)
-                        is_correct = played_order == correct_order
-
-                        # Salvar resultado
-                        game['results'][str(current_round)] = {
-                            'played_order': played_order,
-                            'correct_order': correct_order,
-                            'is_correct': is_correct,
-                            'timestamp': datetime.now().isoformat()
-                        }
-
-                        # Salvar no session state para controlar a revelação
-                        if 'card_reveal' not in st.session_state:
-                            st.session_state.card_reveal = {
-                                'round': current_round,
-                                'correct_order': correct_order,
-                                'played_order': played_order,
-                                'current_card': 0,
-                                'is_correct': is_correct
-                            }
-
-                        games[room_code] = game
-                        save_games(games)
-                        st.rerun()
-   
-                except ValueError:
-                    st.error("Por favor, insira apenas números separados por vírgula!")
+                # Convert player selections to their corresponding numbers
+                played_order = []
+                round_cards = game['cards_per_round'][str(current_round)]
+
+                # Sort each player's hand once and track how many cards they've used
+                sorted_hands = {p: sorted(round_cards[p]) for p in set(player_selections)}
+                used = collections.Counter()
+                overused_player = None
+
+                for player in player_selections:
+                    # A player can't be picked more times than they have cards
+                    if used[player] >= len(sorted_hands[player]):
+                        overused_player = player
+                        break
+                    # Get the player's unused card with the lowest value
+                    played_order.append(sorted_hands[player][used[player]])
+                    used[player] += 1
+
+                if overused_player is not None:
+                    st.error(
+                        f"{overused_player} foi escolhido mais vezes do que tem cartas "
+                        f"({len(sorted_hands[overused_player])})!"
+                    )
+                else:
+                    # Verificar se a ordem está correta
+                    correct_order = game.get('sorted_cards', {}).get(str(current_round))
+                    if correct_order is None:
+                        # Jogos criados antes de 'sorted_cards' existir
+                        correct_order = sorted(itertools.chain.from_iterable(round_cards.values()))
+
+                    is_correct = played_order == correct_order
+                    correct_count = sum(p == c for p, c in zip(played_order, correct_order))
+
+                    # Salvar resultado
+                    game['results'][str(current_round)] = {
+                        'played_order': played_order,
+                        'correct_order': correct_order,
+                        'is_correct': is_correct,
+                        'correct_count': correct_count,
+                        'timestamp': int(time.time())
+                    }
+
+                    # Salvar no session state para controlar a revelação;
+                    # as ordens ficam apenas em game['results']
+                    st.session_state.card_reveal = {
+                        'round': current_round,
+                        'current_card': 0,
+                        'room': room_code
+                    }
+
+                    save_game(room_code, game)
+                    needs_rerun = True
 
         # SISTEMA DE REVELAÇÃO INTERATIVA
-        if 'card_reveal' in st.session_state:
+        reveal_data = st.session_state.get('card_reveal')
+        if (reveal_data is not None and reveal_data.get('room') == room_code
+                and str(reveal_data['round']) in game['results']):
             st.markdown("---")
-            reveal_data = st.session_state.card_reveal
+            result = game['results'][str(reveal_data['round'])]
 
-            if reveal_data['current_card'] < len(reveal_data['correct_order']):
+            if reveal_data['current_card'] < len(result['correct_order']):
                 # Ainda há cartas para revelar
                 st.subheader(f"🎴 Revelação das Cartas - Posição {reveal_data['current_card'] + 1}")
 
@@ -366,44 +599,11 @@ def show_admin_view(room_code, game, games):
                 if reveal_data['current_card'] > 0:
                     st.markdown("### 🔍 Cartas já reveladas:")
 
-                    cols = st.columns(min(reveal_data['current_card'], 6))
-                    for i in range(reveal_data['current_card']):
-                        col_index = i % 6
-                        with cols[col_index]:
-                            card = reveal_data['correct_order'][i]
-                            played_card = reveal_data['played_order'][i] if i < len(reveal_data['played_order']) else None
-
-                            # Determinar se está correto
-                            if played_card == card:
-                                bg_color = "linear-gradient(45deg, #4CAF50, #45a049)"
-                                status = "✅"
-                                result_text = "CORRETO!"
-                            else:
-                                bg_color = "linear-gradient(45deg, #f44336, #da190b)"
-                                status = "❌"
-                                result_text = f"Era {played_card if played_card else '?'}"
-
-                            st.markdown(f"""
-                            <div style='
-                                background: {bg_color};
-                                color: white;
-                                padding: 15px;
-                                border-radius: 10px;
-                                text-align: center;
-                                font-size: 16px;
-                                font-weight: bold;
-                                margin: 5px;
-                                box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-                            '>
-                                {status}<br>
-                                <span style='font-size: 24px;'>{card}</span><br>
-                                <small>{result_text}</small>
-                            </div>
-                            """, unsafe_allow_html=True)
+                    render_reveal_cards(result, reveal_data['current_card'])
 
                 # Botão para revelar próxima carta
                 st.markdown("---")
-                next_card = reveal_data['correct_order'][reveal_data['current_card']]
+                next_card = result['correct_order'][reveal_data['current_card']]
 
                 if st.button(f"🎯 Revelar Carta da Posição {reveal_data['current_card'] + 1}", 
                            key=f"reveal_{reveal_data['current_card']}", 
@@ -416,49 +616,15 @@ def show_admin_view(room_code, game, games):
                 st.subheader("🏁 Revelação Completa!")
 
                 # Resultado final
-                if reveal_data['is_correct']:
+                if result['is_correct']:
                     st.success("🎉 PARABÉNS! Vocês acertaram TODAS as cartas!")
                     st.balloons()
                 else:
-                    correct_count = sum(1 for i in range(len(reveal_data['played_order'])) 
-                                      if i < len(reveal_data['correct_order']) and 
-                                      reveal_data['played_order'][i] == reveal_data['correct_order'][i])
-                    st.warning(f"😅 Vocês acertaram {correct_count} de {len(reveal_data['correct_order'])} cartas!")
+                    st.warning(f"😅 Vocês acertaram {result['correct_count']} de {len(result['correct_order'])} cartas!")
 
                 # Mostrar todas as cartas finais
                 st.markdown("### 📋 Resultado Final:")
-                cols = st.columns(min(len(reveal_data['correct_order']), 6))
-                for i, card in enumerate(reveal_data['correct_order']):
-                    col_index = i % 6
-                    with cols[col_index]:
-                        played_card = reveal_data['played_order'][i] if i < len(reveal_data['played_order']) else None
-
-                        if played_card == card:
-                            bg_color = "linear-gradient(45deg, #4CAF50, #45a049)"
-                            status = "✅"
-                            result_text = "CORRETO!"
-                        else:
-                            bg_color = "linear-gradient(45deg, #f44336, #da190b)"
-                            status = "❌"
-                            result_text = f"Era {played_card if played_card else '?'}"
-
-                        st.markdown(f"""
-                        <div style='
-                            background: {bg_color};
-                            color: white;
-                            padding: 15px;
-                            border-radius: 10px;
-                            text-align: center;
-                            font-size: 16px;
-                            font-weight: bold;
-                            margin: 5px;
-                            box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-                        '>
-                            {status}<br>
-                            <span style='font-size: 24px;'>{card}</span><br>
-                            <small>{result_text}</small>
-                        </div>
-                        """, unsafe_allow_html=True)
+                render_reveal_cards(result, len(result['correct_order']))
 
                 # Botão para continuar
                 st.markdown("---")
@@ -473,9 +639,8 @@ def show_admin_view(room_code, game, games):
                     else:
                         game['status'] = 'finished'
 
-                    games[room_code] = game
-                    save_games(games)
-                    st.rerun()
+                    save_game(room_code, game)
+                    needs_rerun = True
 
     elif game['status'] == 'finished':
         st.subheader("🏁 Jogo Finalizado!")
@@ -491,9 +656,13 @@ def show_admin_view(room_code, game, games):
         game['current_round'] = 1
         game['status'] = 'waiting'
         game['cards_per_round'] = {}
+        game['sorted_cards'] = {}
         game['results'] = {}
-        games[room_code] = game
-        save_games(games)
+        save_game(room_code, game)
+        needs_rerun = True
+
+    # Cada ramo salva logo após alterar o jogo; aqui só recarregamos a página
+    if needs_rerun:
         st.rerun()
 
 
@@ -524,23 +693,7 @@ def show_player_view(game, player_id):
                 st.success("🎴 Suas cartas:")
 
                 # Mostrar cartas em destaque
-                cols = st.columns(len(player_cards))
-                for i, card in enumerate(player_cards):
-                    with cols[i]:
-                        st.markdown(f"""
-                        <div style='
-                            background: linear-gradient(45deg, #FF6B6B, #4ECDC4);
-                            color: white;
-                            padding: 20px;
-                            border-radius: 10px;
-                            text-align: center;
-                            font-size: 24px;
-                            font-weight: bold;
-                            margin: 5px;
-                        '>
-                            {card}
-                        </div>
-                        """, unsafe_allow_html=True)
+                render_player_cards(player_cards)
 
                 st.markdown("---")
                 st.info("💡 Agora escolham uma categoria e discutam presencialmente!")